@@ -1,9 +1,21 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+import hmac
+import threading
 import time
 import os
 
+from profiler import SamplingProfiler, collapse
+
 app = Flask(__name__)
 
+# Observability: Server-Timing headers are on unless SERVER_TIMING=false,
+# the sampling profiler only answers when PROFILER_TOKEN is set
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() != "false"
+app.config["PROFILER_TOKEN"] = os.environ.get("PROFILER_TOKEN", "")
+MAX_PROFILE_SECONDS = 60
+
+profiler = SamplingProfiler()
+
 # Mock data
 MOCK_USERS = [
     {"id": 1, "name": "Alice Johnson", "email": "alice@example.com", "status": "active"},
@@ -11,6 +23,68 @@ MOCK_USERS = [
     {"id": 3, "name": "Carol Williams", "email": "carol@example.com", "status": "inactive"},
 ]
 
+
+# Per-thread timing state: gunicorn's gthread workers serve one request
+# per thread at a time, and a thread-local is far cheaper than flask.g
+_timing = threading.local()
+
+
+class RequestTimer:
+    """
+    WSGI middleware emitting per-phase durations (ms) as a Server-Timing header.
+
+    cpu is the CPU time this thread spent on the request, so total - cpu
+    is time spent waiting: chaos sleeps or the GIL held by other threads.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        start = _timing.start = time.perf_counter()
+        cpu_start = time.thread_time()
+        metrics = _timing.metrics = []
+
+        def timed_start_response(status, headers, exc_info=None):
+            metrics.append(("cpu", time.thread_time() - cpu_start))
+            metrics.append(("total", time.perf_counter() - start))
+            headers.append(("Server-Timing", ", ".join(
+                f"{phase};dur={duration * 1000:.2f}" for phase, duration in metrics
+            )))
+            return start_response(status, headers, exc_info)
+
+        return self.wsgi_app(environ, timed_start_response)
+
+
+class timed:
+    """Record the duration of a request phase for the Server-Timing header"""
+
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        metrics = getattr(_timing, "metrics", None)
+        if metrics is not None:
+            metrics.append((self.phase, time.perf_counter() - self.start))
+
+
+def record_dispatch():
+    """Time spent in Flask before the view runs (context push + URL routing)"""
+    _timing.metrics.append(("dispatch", time.perf_counter() - _timing.start))
+
+
+# With SERVER_TIMING=false nothing is registered, so the request path is
+# exactly the uninstrumented app and timed() finds no metrics to append to
+if SERVER_TIMING:
+    app.wsgi_app = RequestTimer(app.wsgi_app)
+    app.before_request(record_dispatch)
+
+
 @app.route('/health')
 def health():
     """Health check endpoint for Cloud Run"""
@@ -28,7 +102,8 @@ def get_users():
     # Chaos Engineering: Simulate latency
     if request.args.get('chaos') == 'latency':
         app.logger.warning("🔥 CHAOS MODE: Injecting 3s latency")
-        time.sleep(3)
+        with timed("chaos"):
+            time.sleep(3)
     
     # Chaos Engineering: Simulate errors
     if request.args.get('chaos') == 'error':
@@ -39,11 +114,57 @@ def get_users():
         }), 500
     
     # Normal response
-    return jsonify({
-        "users": MOCK_USERS,
-        "count": len(MOCK_USERS),
-        "timestamp": time.time()
-    }), 200
+    with timed("serialize"):
+        response = jsonify({
+            "users": MOCK_USERS,
+            "count": len(MOCK_USERS),
+            "timestamp": time.time()
+        })
+    return response, 200
+
+
+@app.route('/admin/profile', methods=['POST'])
+def profile():
+    """
+    Sample all worker threads for N seconds and return collapsed stacks.
+
+    This is a wall-clock profile: threads blocked in chaos sleeps or on
+    I/O are counted. Idle workers waiting for new connections are skipped.
+    """
+    token = app.config["PROFILER_TOKEN"]
+    if not token:
+        return jsonify({
+            "error": "Not Found",
+            "message": "Profiler is disabled - set PROFILER_TOKEN to enable"
+        }), 404
+
+    supplied = request.headers.get('X-Profiler-Token', '')
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return jsonify({
+            "error": "Forbidden",
+            "message": "Invalid or missing X-Profiler-Token header"
+        }), 403
+
+    try:
+        seconds = float(request.args.get('seconds', '10'))
+    except ValueError:
+        seconds = None
+    if seconds is None or not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return jsonify({
+            "error": "Bad Request",
+            "message": f"seconds must be between 0 and {MAX_PROFILE_SECONDS}"
+        }), 400
+
+    app.logger.warning(f"🔬 PROFILER: Sampling worker threads for {seconds}s")
+    stacks = profiler.sample(seconds)
+    if stacks is None:
+        return jsonify({
+            "error": "Conflict",
+            "message": "A profiling session is already running"
+        }), 409
+
+    # Collapsed stacks: pipe into flamegraph.pl or load in speedscope
+    return Response(collapse(stacks), mimetype='text/plain')
 
 
 @app.route('/', methods=['GET'])
@@ -56,7 +177,8 @@ def root():
             "health": "/health",
             "users": "/api/users",
             "chaos_latency": "/api/users?chaos=latency",
-            "chaos_error": "/api/users?chaos=error"
+            "chaos_error": "/api/users?chaos=error",
+            "profile": "POST /admin/profile?seconds=10 (X-Profiler-Token header)"
         },
         "documentation": "https://github.com/chimpaji/sre-governance-platform"
     }), 200
@@ -0,0 +1,94 @@
+"""
+On-demand sampling profiler for the SRE Governance API.
+
+Samples the Python stacks of every other thread in the process at a fixed
+interval using sys._current_frames() and aggregates them into collapsed
+stacks ("frame;frame;frame count"), the input format of flamegraph.pl and
+speedscope. Nothing runs while the profiler is idle, so it costs nothing
+until an operator asks for a profile.
+
+Profiles are wall-clock: a thread sleeping or blocked on I/O inside a
+request is sampled like one burning CPU. Threads parked in the server's
+idle waits (gunicorn's poller, idle thread-pool workers) are skipped, so
+the output shows request work rather than workers waiting for traffic.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# (file, function) pairs that mark a thread as idle when they are its
+# innermost frame outside threading.py: selector polling, futures.wait
+# and thread-pool workers waiting for their next work item
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("_base.py", "wait"),
+    ("thread.py", "_worker"),
+}
+
+
+def _is_idle(frame):
+    """True if the thread is parked in one of the server's idle waits"""
+    while frame is not None and os.path.basename(frame.f_code.co_filename) == "threading.py":
+        frame = frame.f_back
+    if frame is None:
+        return False
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+def _frame_label(frame):
+    """Stable label for a stack frame: function (file:first line)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler that runs one session at a time"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    def sample(self, duration, interval=None):
+        """
+        Sample all other threads for `duration` seconds from the calling thread.
+
+        Returns a Counter of collapsed stacks, or None if a session is
+        already in progress.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+
+        interval = interval or self.interval
+        own_ident = threading.get_ident()
+        stacks = Counter()
+
+        try:
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident or _is_idle(frame):
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(names.get(ident, f"thread-{ident}"))
+                    stacks[";".join(reversed(labels))] += 1
+                time.sleep(interval)
+        finally:
+            self._lock.release()
+
+        return stacks
+
+
+def collapse(stacks):
+    """Render sampled stacks in collapsed (flamegraph-ready) text format"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
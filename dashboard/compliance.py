@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Compliance Check Runner
+
+Runs the checks behind the dashboard's Compliance view concurrently on a
+worker pool with a per-check timeout:
+
+1. Dependency Vulnerability Scan - requirements files vs the local advisory DB
+2. IAM Permission Audit - IAM bindings declared in terraform/main.tf
+3. Resource Inventory Update - Terraform resources and unused service accounts
+4. SLO Compliance Report - Terraform SLO goals vs measured SLO data
+
+Each result is cached under a SHA-256 of the check's inputs, so a check
+whose files (and parameters) have not changed is never re-run. The
+dashboard reads the cache directly and only runs checks on demand.
+
+Usage:
+    python dashboard/compliance.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ADVISORY_DB = "dashboard/advisories.json"
+TERRAFORM_MAIN = "terraform/main.tf"
+REQUIREMENTS_FILES = [
+    "api/requirements.txt",
+    "dashboard/requirements.txt",
+    "functions/alert-handler/requirements.txt",
+]
+CACHE_FILE = Path(__file__).resolve().parent / ".compliance_cache.json"
+CACHE_VERSION = "1"  # Bump when check logic changes to invalidate cached results
+_cache_lock = threading.Lock()
+
+PUBLIC_MEMBERS = {"allUsers", "allAuthenticatedUsers"}
+PRIMITIVE_ROLES = {"roles/owner", "roles/editor"}
+SEVERITY_ORDER = ["low", "moderate", "high", "critical"]
+
+
+# ========================================
+# PARSING HELPERS
+# ========================================
+def _version_tuple(version):
+    """Numeric release segments of a version string, e.g. '2.32.5' -> (2, 32, 5)"""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def _is_older(version, fixed):
+    """True if `version` sorts before `fixed` (release segments only)"""
+    a, b = _version_tuple(version), _version_tuple(fixed)
+    width = max(len(a), len(b))
+    return a + (0,) * (width - len(a)) < b + (0,) * (width - len(b))
+
+
+def parse_requirements(text):
+    """Yield (package, operator, version) for each requirement line"""
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        match = re.match(r"([A-Za-z0-9_.\-]+)(\[[^\]]*\])?\s*(==|~=|>=|<=|!=|>|<)?\s*([^\s;,]*)", line)
+        if match:
+            name = re.sub(r"[-_.]+", "-", match.group(1)).lower()
+            yield name, match.group(3) or "", match.group(4)
+
+
+def terraform_resources(text):
+    """Return (type, name, body) for every top-level resource block"""
+    resources = []
+    for match in re.finditer(r'^resource\s+"([^"]+)"\s+"([^"]+)"\s*\{', text, re.M):
+        depth, pos = 1, match.end()
+        while depth and pos < len(text):
+            depth += {"{": 1, "}": -1}.get(text[pos], 0)
+            pos += 1
+        resources.append((match.group(1), match.group(2), text[match.end():pos - 1]))
+    return resources
+
+
+def _attribute(body, key):
+    """First `key = value` in a block body, with quotes and comments stripped"""
+    match = re.search(rf"^\s*{key}\s*=\s*(\"[^\"]*\"|[^\s#]+)", body, re.M)
+    return match.group(1).strip('"') if match else None
+
+
+def _status(findings):
+    """fail on any high/critical finding, warning on anything else, else pass"""
+    if any(SEVERITY_ORDER.index(f["severity"]) >= 2 for f in findings):
+        return "fail"
+    return "warning" if findings else "pass"
+
+
+# ========================================
+# CHECKS
+# ========================================
+def check_dependencies(inputs, params):
+    """Match pinned requirements against the local advisory DB"""
+    advisories = json.loads(inputs[ADVISORY_DB])
+    findings = []
+    scanned = 0
+
+    for path in REQUIREMENTS_FILES:
+        for package, operator, version in parse_requirements(inputs[path]):
+            scanned += 1
+            if operator != "==" or "*" in version:
+                findings.append({
+                    "type": "hygiene",
+                    "severity": "low",
+                    "id": "UNPINNED",
+                    "message": f"{package} is not pinned to an exact version in {path} ({operator}{version or 'any'})",
+                })
+                continue
+            for advisory in advisories.get(package, []):
+                if _is_older(version, advisory["fixed"]):
+                    findings.append({
+                        "type": "vulnerability",
+                        "severity": advisory["severity"],
+                        "id": advisory["id"],
+                        "message": f"{package}=={version} in {path}: {advisory['summary']} - update to {advisory['fixed']}+",
+                    })
+
+    vulnerabilities = sum(1 for f in findings if f["type"] == "vulnerability")
+    return {
+        "status": _status(findings),
+        "summary": f"{scanned} packages scanned, {vulnerabilities} known vulnerabilities",
+        "findings": findings,
+    }
+
+
+def check_iam(inputs, params):
+    """Flag public members, primitive roles and admin roles in IAM bindings"""
+    findings = []
+    bindings = [
+        (name, _attribute(body, "role"), _attribute(body, "member"))
+        for rtype, name, body in terraform_resources(inputs[TERRAFORM_MAIN])
+        if rtype.endswith("_iam_member")
+    ]
+
+    for name, role, member in bindings:
+        if member in PUBLIC_MEMBERS:
+            findings.append({
+                "type": "iam",
+                "severity": "moderate",
+                "id": "PUBLIC_ACCESS",
+                "message": f"{name}: {role} granted to {member}",
+            })
+        if role in PRIMITIVE_ROLES:
+            findings.append({
+                "type": "iam",
+                "severity": "high",
+                "id": "PRIMITIVE_ROLE",
+                "message": f"{name}: primitive role {role} granted to {member}",
+            })
+        elif role and role.lower().endswith("admin"):
+            findings.append({
+                "type": "iam",
+                "severity": "high",
+                "id": "ADMIN_ROLE",
+                "message": f"{name}: overprivileged role {role} granted to {member}",
+            })
+
+    return {
+        "status": _status(findings),
+        "summary": f"{len(bindings)} IAM bindings audited, {len(findings)} findings",
+        "findings": findings,
+    }
+
+
+def check_inventory(inputs, params):
+    """Count managed resources and flag service accounts nothing references"""
+    text = inputs[TERRAFORM_MAIN]
+    resources = terraform_resources(text)
+    findings = []
+
+    for rtype, name, _ in resources:
+        if rtype == "google_service_account" and f"{rtype}.{name}." not in text:
+            findings.append({
+                "type": "inventory",
+                "severity": "low",
+                "id": "UNUSED_SERVICE_ACCOUNT",
+                "message": f"Service account {name} is declared but never referenced",
+            })
+
+    types = {rtype for rtype, _, _ in resources}
+    return {
+        "status": _status(findings),
+        "summary": f"{len(resources)} Terraform resources across {len(types)} types",
+        "findings": findings,
+    }
+
+
+def check_slo(inputs, params):
+    """Compare Terraform SLO goals against measured SLO data"""
+    slo_data = params.get("slo_data")
+    findings = []
+    slos = [
+        (name, _attribute(body, "display_name"), float(_attribute(body, "goal")), _attribute(body, "max"))
+        for rtype, name, body in terraform_resources(inputs[TERRAFORM_MAIN])
+        if rtype == "google_monitoring_slo"
+    ]
+
+    if not slo_data:
+        return {
+            "status": "warning",
+            "summary": f"{len(slos)} SLOs defined, no measurements provided",
+            "findings": [],
+        }
+
+    for name, display_name, goal, threshold_ms in slos:
+        if threshold_ms is not None:
+            # Latency SLO: goal% of requests under threshold <=> p<goal> under threshold
+            key = f"latency_p{round(goal * 100)}"
+            actual = slo_data.get(key, {}).get("actual")
+            met = actual is not None and actual < float(threshold_ms)
+            target = f"p{round(goal * 100)} < {threshold_ms}ms"
+        else:
+            actual = slo_data.get("availability", {}).get("actual")
+            met = actual is not None and actual >= goal * 100
+            target = f">= {goal * 100:g}%"
+        if not met:
+            findings.append({
+                "type": "slo",
+                "severity": "high",
+                "id": name.upper(),
+                "message": f"{display_name} breached: target {target}, actual {actual if actual is not None else 'no data'}",
+            })
+
+    return {
+        "status": _status(findings),
+        "summary": f"{len(slos) - len(findings)}/{len(slos)} SLOs met",
+        "findings": findings,
+    }
+
+
+# params: the run_checks() arguments a check reads; only those enter its
+# cache key, so e.g. new SLO measurements never re-run the dependency scan.
+# interval: how long a result counts as fresh before a re-check is due.
+CHECKS = [
+    {"key": "dependency_scan", "name": "Dependency Vulnerability Scan", "run": check_dependencies,
+     "inputs": REQUIREMENTS_FILES + [ADVISORY_DB], "params": [], "timeout": 30, "interval": timedelta(days=1)},
+    {"key": "iam_audit", "name": "IAM Permission Audit", "run": check_iam,
+     "inputs": [TERRAFORM_MAIN], "params": [], "timeout": 10, "interval": timedelta(days=1)},
+    {"key": "resource_inventory", "name": "Resource Inventory Update", "run": check_inventory,
+     "inputs": [TERRAFORM_MAIN], "params": [], "timeout": 10, "interval": timedelta(days=1)},
+    {"key": "slo_report", "name": "SLO Compliance Report", "run": check_slo,
+     "inputs": [TERRAFORM_MAIN], "params": ["slo_data"], "timeout": 10, "interval": timedelta(hours=1)},
+]
+
+
+# ========================================
+# CACHE + RUNNER
+# ========================================
+def _content_hash(check, inputs, params):
+    """SHA-256 over the check version, its input files and its parameters"""
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{check['key']}".encode())
+    for path in check["inputs"]:
+        digest.update(path.encode() + b"\0" + inputs[path].encode() + b"\0")
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_results():
+    """Cached results keyed by check key - reads only the cache file"""
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_results(results):
+    """Write the cache atomically via a per-writer temp file"""
+    with tempfile.NamedTemporaryFile("w", dir=CACHE_FILE.parent, prefix=".compliance_cache.",
+                                     suffix=".tmp", delete=False) as tmp:
+        json.dump(results, tmp, indent=2)
+    try:
+        os.replace(tmp.name, CACHE_FILE)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+class _Job:
+    """A check waiting for, or running on, a worker thread"""
+
+    def __init__(self, check, inputs, params, content_hash):
+        self.check = check
+        self.inputs = inputs
+        self.params = params
+        self.content_hash = content_hash
+        self.started = None
+        self.result = None
+
+
+def _run_jobs(jobs, max_workers):
+    """
+    Run jobs on a pool of daemon threads and return {check key: result}.
+
+    A job's timeout starts when a worker picks it up, not when it is
+    queued. A worker stuck past its job's timeout is abandoned and
+    replaced, and because workers are daemon threads the interpreter
+    never waits for it on exit.
+    """
+    queue = deque(jobs)
+    cond = threading.Condition()
+    results = {}
+
+    def worker():
+        while True:
+            with cond:
+                if not queue:
+                    return
+                job = queue.popleft()
+                job.started = time.monotonic()
+                cond.notify()
+            try:
+                result = job.check["run"](job.inputs, job.params)
+                result["hash"] = job.content_hash
+            except Exception as e:
+                result = {"status": "error", "summary": f"{type(e).__name__}: {e}", "findings": []}
+            with cond:
+                job.result = result
+                cond.notify()
+
+    def spawn_worker():
+        threading.Thread(target=worker, name="compliance", daemon=True).start()
+
+    with cond:
+        for _ in range(min(max_workers, len(jobs))):
+            spawn_worker()
+
+        while len(results) < len(jobs):
+            now = time.monotonic()
+            next_deadline = None
+            for job in jobs:
+                key = job.check["key"]
+                if key in results or job.started is None:
+                    continue
+                deadline = job.started + job.check["timeout"]
+                if job.result is not None:
+                    results[key] = job.result
+                elif now >= deadline:
+                    results[key] = {"status": "timeout", "summary": f"Timed out after {job.check['timeout']}s", "findings": []}
+                    spawn_worker()
+                else:
+                    next_deadline = deadline if next_deadline is None else min(next_deadline, deadline)
+            if len(results) < len(jobs):
+                cond.wait(None if next_deadline is None else next_deadline - now)
+
+    return results
+
+
+def run_checks(slo_data=None, max_workers=4):
+    """
+    Run every check whose inputs changed since its cached result.
+
+    Cache hits are confirmed rather than re-run: their checked_at moves to
+    now while last_run keeps the time of the last actual scan. Timed-out
+    or crashing checks are reported but not cached, so they are retried
+    on the next run.
+    """
+    run_params = {"slo_data": slo_data}
+    now = datetime.now().isoformat(timespec="seconds")
+
+    # Serialize whole runs: concurrent dashboard sessions would otherwise
+    # read the same cache, scan twice and overwrite each other's results
+    with _cache_lock:
+        cache = load_results()
+        results = {}
+        pending = []
+
+        for check in CHECKS:
+            try:
+                inputs = {path: (REPO_ROOT / path).read_text() for path in check["inputs"]}
+            except OSError as e:
+                results[check["key"]] = {"status": "error", "summary": f"{type(e).__name__}: {e}",
+                                         "findings": [], "last_run": now}
+                continue
+            params = {name: run_params[name] for name in check["params"]}
+            content_hash = _content_hash(check, inputs, params)
+            cached = cache.get(check["key"])
+            if cached and cached.get("hash") == content_hash:
+                results[check["key"]] = cached
+            else:
+                pending.append(_Job(check, inputs, params, content_hash))
+
+        for key, result in _run_jobs(pending, max_workers).items():
+            result["last_run"] = now
+            results[key] = result
+        for result in results.values():
+            result["checked_at"] = now
+
+        # Only completed checks are cached; keep the previous good result otherwise
+        _save_results({
+            key: result if "hash" in result else cache[key]
+            for key, result in results.items()
+            if "hash" in result or key in cache
+        })
+    return results
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    results = run_checks()
+    for check in CHECKS:
+        result = results[check["key"]]
+        print(f"[{result['status'].upper():>7}] {check['name']}: {result['summary']}")
+        for finding in result["findings"]:
+            print(f"          {finding['severity']:<8} {finding['id']}: {finding['message']}")
+    print(f"Completed in {(time.perf_counter() - start) * 1000:.1f}ms")
@@ -0,0 +1,135 @@
+"""Tests for the compliance check runner: caching, timeouts and errors."""
+
+import json
+import time
+
+import pytest
+
+import compliance
+
+TERRAFORM = '''
+resource "google_service_account" "function_sa" {
+  account_id = "alert-handler-sa"
+}
+
+resource "google_project_iam_member" "function_logging" {
+  role   = "roles/logging.logWriter"
+  member = "serviceAccount:${google_service_account.function_sa.email}"
+}
+
+resource "google_monitoring_slo" "api_availability" {
+  display_name = "API Availability SLO"
+  goal         = 0.995
+}
+'''
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A minimal repo tree with every check input, and a cache in tmp_path"""
+    files = {
+        "api/requirements.txt": "Flask==3.0.0\n",
+        "dashboard/requirements.txt": "streamlit==1.37.0\n",
+        "functions/alert-handler/requirements.txt": "functions-framework==3.5.0\n",
+        compliance.ADVISORY_DB: "{}",
+        compliance.TERRAFORM_MAIN: TERRAFORM,
+    }
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+
+    monkeypatch.setattr(compliance, "REPO_ROOT", tmp_path)
+    monkeypatch.setattr(compliance, "CACHE_FILE", tmp_path / ".compliance_cache.json")
+    return tmp_path
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Wrap every check so tests can see which ones actually ran"""
+    ran = []
+
+    def counting(check):
+        def run(inputs, params):
+            ran.append(check["key"])
+            return check["run"](inputs, params)
+        return dict(check, run=run)
+
+    monkeypatch.setattr(compliance, "CHECKS", [counting(c) for c in compliance.CHECKS])
+    return ran
+
+
+def replace_check(monkeypatch, key, **overrides):
+    checks = [dict(c, **overrides) if c["key"] == key else c for c in compliance.CHECKS]
+    monkeypatch.setattr(compliance, "CHECKS", checks)
+
+
+def test_cache_hit_skips_scan_and_keeps_last_run(repo, calls):
+    compliance.run_checks()
+    cache = compliance.load_results()
+    for result in cache.values():
+        result["last_run"] = "2025-01-01T00:00:00"
+    compliance.CACHE_FILE.write_text(json.dumps(cache))
+    calls.clear()
+
+    results = compliance.run_checks()
+
+    assert calls == []
+    assert all(r["last_run"] == "2025-01-01T00:00:00" for r in results.values())
+    assert all(r["checked_at"] != "2025-01-01T00:00:00" for r in results.values())
+
+
+def test_changed_input_reruns_only_checks_that_read_it(repo, calls):
+    compliance.run_checks()
+    calls.clear()
+
+    (repo / "api/requirements.txt").write_text("Flask==3.0.3\n")
+    compliance.run_checks()
+
+    assert calls == ["dependency_scan"]
+
+
+def test_slo_data_only_reruns_slo_check(repo, calls):
+    compliance.run_checks()
+    calls.clear()
+
+    compliance.run_checks(slo_data={"availability": {"actual": 99.9}})
+
+    assert calls == ["slo_report"]
+
+
+def test_hanging_check_times_out_and_is_not_cached(repo, monkeypatch):
+    def hang(inputs, params):
+        time.sleep(5)
+
+    replace_check(monkeypatch, "iam_audit", run=hang, timeout=0.2)
+    start = time.monotonic()
+
+    results = compliance.run_checks()
+
+    assert time.monotonic() - start < 2
+    assert results["iam_audit"]["status"] == "timeout"
+    assert results["resource_inventory"]["status"] != "timeout"
+    assert "iam_audit" not in compliance.load_results()
+
+
+def test_raising_check_reports_error_and_is_not_cached(repo, monkeypatch):
+    def crash(inputs, params):
+        raise ValueError("bad advisory DB")
+
+    replace_check(monkeypatch, "dependency_scan", run=crash)
+
+    results = compliance.run_checks()
+
+    assert results["dependency_scan"]["status"] == "error"
+    assert "bad advisory DB" in results["dependency_scan"]["summary"]
+    assert "dependency_scan" not in compliance.load_results()
+
+
+def test_missing_input_marks_only_that_check_as_error(repo):
+    (repo / compliance.ADVISORY_DB).unlink()
+
+    results = compliance.run_checks()
+
+    assert results["dependency_scan"]["status"] == "error"
+    assert results["iam_audit"]["status"] == "pass"
+    assert "dependency_scan" not in compliance.load_results()